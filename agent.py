@@ -1,6 +1,11 @@
 import logging
 import asyncio
+import os
+import random
 import re
+from collections import OrderedDict
+from contextlib import aclosing
+from typing import AsyncIterable
 
 from dotenv import load_dotenv
 from livekit.agents import (
@@ -8,16 +13,34 @@ from livekit.agents import (
     Agent,
     AgentFalseInterruptionEvent,
     AgentSession,
+    AgentStateChangedEvent,
+    ChatContext,
+    ConversationItemAddedEvent,
     JobContext,
     JobProcess,
     MetricsCollectedEvent,
+    ModelSettings,
     RoomInputOptions,
+    UserInputTranscribedEvent,
     WorkerOptions,
     cli,
+    llm,
     metrics, )
+# 插件必须在模块顶层导入：LiveKit 插件在导入时向主线程注册自身，
+# 轮次检测模型还需在 worker 主进程中注册推理执行器，`download-files` 命令也依赖这些注册信息
 from livekit.plugins import cartesia, noise_cancellation, openai, silero
 from livekit.plugins.turn_detector.multilingual import MultilingualModel
-from requests import session
+
+from text_clean import clean_llm_output, is_chinese_text
+
+# 使用 uvloop 作为事件循环以降低网络回调开销（Windows 等未安装 uvloop 的平台回退到默认 asyncio）
+# 放在模块级别而不是 __main__ 中，确保 worker 派生的 job 子进程在导入本模块时同样生效
+try:
+    import uvloop
+except ImportError:
+    pass
+else:
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 
 # 创建日志记录器
 logger = logging.getLogger("agent")
@@ -25,89 +48,203 @@ logger = logging.getLogger("agent")
 # 加载环境变量配置文件
 load_dotenv(".env.local")
 
+# 是否使用 OpenAI 实时语音模型（语音到语音）替代 STT + LLM + TTS 管道
+USE_REALTIME_MODEL = os.getenv("USE_REALTIME_MODEL", "").lower() in ("1", "true", "yes")
+# OPENAI_API_KEY 用于 DeepSeek，实时模型需要单独的 OpenAI 密钥；未配置时立即报错，避免误用 DeepSeek 密钥
+OPENAI_REALTIME_API_KEY = os.getenv("OPENAI_REALTIME_API_KEY")
+if USE_REALTIME_MODEL and not OPENAI_REALTIME_API_KEY:
+    raise RuntimeError("已开启 USE_REALTIME_MODEL，但未设置 OPENAI_REALTIME_API_KEY")
 
-def clean_llm_output(text: str) -> str:
-    """
-    清理 LLM 输出文本，去除 <think></think> 标签和标点符号
-    只保留单词用于 TTS 合成
-    """
-    if not text:
-        return ""
+# 欢迎语
+WELCOME_MESSAGE = "你好，我是你的AI翻译助手，请说中文，我会帮你翻译成英文"
 
-    # 去除 <think></think> 标签及其内容
-    text = re.sub(r'<think>.*?</think>', '', text, flags=re.DOTALL | re.IGNORECASE)
+# 模型服务地址：可通过环境变量指向地理位置更近的接入点或代理，降低每轮请求的网络往返延迟
+DEEPSEEK_BASE_URL = os.getenv("DEEPSEEK_BASE_URL", "https://api.deepseek.com")
+CARTESIA_BASE_URL = os.getenv("CARTESIA_BASE_URL", "https://api.cartesia.ai")
 
-    # 去除所有标点符号，只保留字母、数字和空格
-    text = re.sub(r'[^\w\s]', '', text)
+# 端点检测延迟（秒）：翻译场景中用户的话通常简短完整，缩短静音等待时间以减少每轮的空等
+# 轮次检测模型判断用户已说完时使用最小延迟，判断未说完时最多等待最大延迟
+MIN_ENDPOINTING_DELAY = 0.05
+MAX_ENDPOINTING_DELAY = 0.5
 
-    # 去除多余的空格
-    text = ' '.join(text.split())
+# LLM 输出中文检测的抽样比例（DEBUG 日志级别下始终检测）
+CJK_CHECK_SAMPLE_RATE = 0.01
 
-    return text.strip()
+# LLM 模型名称；只有 deepseek-reasoner 这类推理模型才会输出 <think></think> 标签
+MODEL_NAME = "deepseek-chat"
+_MODEL_EMITS_THINK = "reasoner" in MODEL_NAME
 
+# 流式清理时用于跨 chunk 追踪 <think></think> 标签
+_THINK_OPEN_RE = re.compile(r'<think>', re.IGNORECASE)
+_THINK_CLOSE_RE = re.compile(r'</think>', re.IGNORECASE)
 
-def is_chinese_text(text: str) -> bool:
+
+async def clean_llm_stream(text: AsyncIterable[str]) -> AsyncIterable[str]:
     """
-    检测文本是否包含中文字符
+    流式清理 LLM 输出：逐个接收 token 增量并立即转发给 TTS，只去除跨 chunk 的 <think></think> 推理内容。
+    标点符号保持不变，TTS 依赖句末标点切分句子后才开始合成
     """
-    chinese_pattern = re.compile(r'[\u4e00-\u9fff]+')
-    return bool(chinese_pattern.search(text))
+    if not _MODEL_EMITS_THINK:
+        async for chunk in text:
+            yield chunk
+        return
+
+    buffer = ""
+    in_think = False
+
+    async for chunk in text:
+        buffer += chunk
+        while buffer:
+            if in_think:
+                # 在 <think> 内部：丢弃内容直到遇到闭合标签，保留尾部以防标签被 chunk 截断
+                match = _THINK_CLOSE_RE.search(buffer)
+                if match is None:
+                    buffer = buffer[-(len("</think>") - 1):]
+                    break
+                buffer = buffer[match.end():]
+                in_think = False
+                continue
+
+            match = _THINK_OPEN_RE.search(buffer)
+            if match is not None:
+                if match.start():
+                    yield buffer[:match.start()]
+                buffer = buffer[match.end():]
+                in_think = True
+                continue
+
+            # 末尾可能是被 chunk 截断的 <think> 标签，先留在缓冲区，其余部分立即转发
+            tail = buffer.rfind("<")
+            if tail >= 0 and "<think>".startswith(buffer[tail:].lower()):
+                if tail:
+                    yield buffer[:tail]
+                buffer = buffer[tail:]
+            else:
+                yield buffer
+                buffer = ""
+            break
+
+    if buffer and not in_think:
+        yield buffer
+
+
+# 翻译缓存：用户经常重复简短的话（"你好"、"谢谢"），命中缓存时直接返回翻译结果，跳过 LLM
+_TRANSLATION_CACHE_SIZE = 512
+_translation_cache: OrderedDict[str, str] = OrderedDict()
+
+
+def _normalize_utterance(text: str) -> str:
+    """规范化 STT 文本作为缓存键：去除标点、合并空格并转为小写"""
+    return clean_llm_output(text).lower()
+
+
+def get_cached_translation(text: str) -> str | None:
+    """查询翻译缓存，命中时将其标记为最近使用"""
+    key = _normalize_utterance(text)
+    translation = _translation_cache.get(key)
+    if translation is not None:
+        _translation_cache.move_to_end(key)
+    return translation
+
+
+def cache_translation(text: str, translation: str) -> None:
+    """写入翻译缓存，超出容量时淘汰最久未使用的条目"""
+    key = _normalize_utterance(text)
+    if not key or not translation:
+        return
+    _translation_cache[key] = translation
+    _translation_cache.move_to_end(key)
+    if len(_translation_cache) > _TRANSLATION_CACHE_SIZE:
+        _translation_cache.popitem(last=False)
+
+
+def _last_user_text(chat_ctx: ChatContext) -> str:
+    """取出对话上下文中最后一条用户消息的文本"""
+    for item in reversed(chat_ctx.items):
+        if item.type == "message" and item.role == "user":
+            return item.text_content or ""
+    return ""
+
+
+# 翻译示例 (中文, 英文)，作为少样本对话预置到会话上下文中
+_FEW_SHOT_EXAMPLES = [
+    ("你好，很高兴见到你", "Hello, nice to meet you."),
+    ("今天天气真不错", "The weather is really nice today."),
+    ("我想喝水", "I want to drink water."),
+]
 
 
 class AITranslatorAssistant(Agent):
     """AI 中译英翻译助手类"""
 
     def __init__(self) -> None:
+        # 少样本示例只在会话开始时写入一次对话上下文，保持稳定的前缀以便服务端复用前缀缓存
+        chat_ctx = ChatContext()
+        for chinese, english in _FEW_SHOT_EXAMPLES:
+            chat_ctx.add_message(role="user", content=chinese)
+            chat_ctx.add_message(role="assistant", content=english)
+
         super().__init__(
             # 设置 AI 助手的基本指令：专门负责中文到英文的实时语音翻译
-            instructions="""You are a Chinese-to-English translation assistant. Your ONLY job is to translate Chinese input into English.
-
-CRITICAL RULES:
-1. You MUST ALWAYS respond in English, never in Chinese
-2. When user speaks Chinese, translate it to English immediately
-3. Do NOT repeat the Chinese text
-4. Do NOT add explanations or prefixes like "The translation is" or "In English"
-5. Output ONLY the English translation
-6. Do NOT use any tags like <think></think>
-7. Keep responses concise and natural
-
-Examples:
-User: "你好，很高兴见到你" 
-You: "Hello nice to meet you"
-
-User: "今天天气真不错"
-You: "The weather is really nice today"
-
-User: "我想喝水"
-You: "I want to drink water"
-
-REMEMBER: Always respond in English only. Never output Chinese characters.""",
+            # 指令尽量简短，减少每轮请求的预填充 token 数和首字延迟
+            # 注意：指令必须保持固定，不要插入时间、房间名等变量，否则 DeepSeek 的前缀缓存无法命中
+            instructions="Translate the user's Chinese into concise spoken English. Output English only.",
+            chat_ctx=chat_ctx,
         )
 
-    async def say(self, message: str, **kwargs) -> None:
-        """重写 say 方法，在发送到 TTS 前清理文本并检查语言"""
-        # 记录原始 LLM 输出
-        logger.info(f"LLM 原始输出: '{message}'")
-
-        # 检查是否包含中文字符
-        if is_chinese_text(message):
-            logger.error(f"警告：LLM 输出包含中文字符，应该是英文翻译！原文: '{message}'")
-            # 强制使用英文默认响应
-            cleaned_message = "I apologize but I need to translate that to English"
-        else:
-            # 清理文本：去除 <think></think> 标签和标点符号
-            cleaned_message = clean_llm_output(message)
-
-            # 如果清理后的文本为空，使用默认响应
-            if not cleaned_message:
-                cleaned_message = "Sorry I could not translate that"
-                logger.warning("清理后文本为空，使用默认响应")
-
-        # 记录清理后的文本
-        logger.info(f"清理后的文本: '{cleaned_message}'")
-
-        # 调用父类的 say 方法发送清理后的文本到 TTS
-        await session.say(cleaned_message, **kwargs)
+    async def llm_node(
+        self,
+        chat_ctx: ChatContext,
+        tools: list[llm.FunctionTool],
+        model_settings: ModelSettings,
+    ) -> AsyncIterable[llm.ChatChunk | str]:
+        """
+        重写 LLM 节点：非中文输入直接返回原文，命中翻译缓存时直接返回缓存结果，
+        否则调用 LLM，抽样记录输出语言异常，并在生成完成后写入缓存
+        """
+        # 用户原文取自本次请求的上下文，预生成模式下 LLM 提前启动时同样能拿到正确的内容
+        user_text = _last_user_text(chat_ctx)
+
+        # 用户说的不是中文（如误触发或直接说英文）时无需翻译，原样输出且不发起 LLM 请求
+        if not is_chinese_text(user_text):
+            logger.info("STT 结果不含中文，跳过 LLM: '%s'", user_text)
+            if clean_llm_output(user_text):
+                yield user_text
+            return
+
+        cached = get_cached_translation(user_text)
+        if cached is not None:
+            logger.info("翻译缓存命中: '%s' -> '%s'", user_text, cached)
+            yield cached
+            return
+
+        # 检查输出是否包含中文字符：提示词稳定后很少出错，生产环境只按比例抽样检查，DEBUG 日志级别下每次都检查
+        # 仅用于观测：已输出的内容可能已经在播报，这里只记录错误日志，不替换回复
+        check_language = logger.isEnabledFor(logging.DEBUG) or random.random() < CJK_CHECK_SAMPLE_RATE
+        parts = []
+        async with aclosing(Agent.default.llm_node(self, chat_ctx, tools, model_settings)) as stream:
+            async for chunk in stream:
+                if isinstance(chunk, str):
+                    content = chunk
+                else:
+                    content = chunk.delta.content if chunk.delta is not None else None
+                if content:
+                    parts.append(content)
+                    if check_language and is_chinese_text(content):
+                        logger.error("警告：LLM 输出包含中文字符，应该是英文翻译！原文: '%s'", "".join(parts))
+                        # 每条回复只记录一次
+                        check_language = False
+                yield chunk
+
+        # 只有完整生成（未被取消）的翻译才会执行到这里；含中文的结果不写入缓存，避免错误翻译被反复播报
+        # 这里每个未命中缓存的轮次都会完整扫描一次（不抽样），以保护缓存；纯 ASCII 输出在 isascii 处即返回
+        translation = "".join(parts).strip()
+        if not is_chinese_text(translation):
+            cache_translation(user_text, translation)
+
+    def tts_node(self, text: AsyncIterable[str], model_settings: ModelSettings):
+        """重写 TTS 节点，在 LLM 流式输出的同时清理文本并送入 TTS，降低首字音频延迟"""
+        return Agent.default.tts_node(self, clean_llm_stream(text), model_settings)
 
     async def on_enter(self) -> None:
         """当用户进入房间时的英文欢迎消息"""
@@ -118,6 +255,15 @@ REMEMBER: Always respond in English only. Never output Chinese characters.""",
             logger.exception("欢迎语播报失败：on_enter 阶段调用 say 出错，已跳过")
 
 
+async def _warm_up_llm(model: openai.LLM) -> None:
+    """向 LLM 服务发送一次轻量请求（GET /models），提前建立连接池中的 TLS/TCP 连接"""
+    # openai.LLM 没有实现 prewarm()，也没有公开底层客户端，这里直接使用其 OpenAI 客户端
+    try:
+        await model._client.models.list()
+    except Exception:
+        logger.warning("LLM 连接预热失败，首轮对话时将重新建立连接", exc_info=True)
+
+
 def prewarm(proc: JobProcess):
     """预热函数：在 Agent 启动前预加载模型以提高响应速度"""
     # 加载 Silero VAD (语音活动检测) 模型，用于检测用户是否在说话
@@ -131,65 +277,105 @@ async def entrypoint(ctx: JobContext):
         "room": ctx.room.name,
     }
 
-    # 创建语音 AI 管道，整合 LLM、STT、TTS 和语音检测功能
-    session = AgentSession(
+    llm_warmup = None
+    if USE_REALTIME_MODEL:
+        # 实时语音到语音模型：音频输入和输出在同一个流式模型中完成，
+        # 省去 STT → LLM → TTS 三段串行延迟
+        session = AgentSession(
+            llm=openai.realtime.RealtimeModel(
+                voice="marin",
+                api_key=OPENAI_REALTIME_API_KEY,
+                # 关闭服务端 VAD，由本地的轮次检测决定用户何时说完
+                turn_detection=None,
+            ),
+            # 本地轮次检测模型基于 STT 转录结果运行，因此实时模式下仍需要 STT
+            stt=cartesia.STT(
+                model="ink-whisper",
+                base_url=CARTESIA_BASE_URL,
+            ),
+            # 保留轮次检测和 VAD，用于判断说话结束和打断
+            turn_detection=MultilingualModel(),
+            vad=ctx.proc.userdata["vad"],
+            # 服务端 VAD 已关闭，轮次结束由本地判定，端点检测延迟同样生效
+            min_endpointing_delay=MIN_ENDPOINTING_DELAY,
+            max_endpointing_delay=MAX_ENDPOINTING_DELAY,
+        )
+    else:
         # LLM (大语言模型) - Agent 的"大脑"，处理用户输入并生成翻译响应
         # 使用 DeepSeek Chat 模型进行中译英翻译
-        llm=openai.LLM(model="deepseek-chat", base_url="https://api.deepseek.com"),
-
-        # STT (语音转文本) - Agent 的"耳朵"，将用户的中文语音转换为文本
-        # 使用 Cartesia 的 ink-whisper 模型进行语音识别
-        stt=cartesia.STT(
-            model="ink-whisper"
-        ),
-        # TTS (文本转语音) - Agent 的"嘴巴"，将翻译后的英文文本转换为语音
-        # 使用指定的语音 ID 生成自然的英文语音
-        tts=cartesia.TTS(voice="6f84f4b8-58a2-430c-8c79-688dad597532"),
-        # 多语言轮次检测 - 判断用户何时开始和结束说话
-        turn_detection=MultilingualModel(),
-        # VAD (语音活动检测) - 检测是否有语音输入
-        vad=ctx.proc.userdata["vad"],
-        # 预生成模式 - 允许 LLM 在等待用户说话结束前就开始生成响应，提高响应速度
-        preemptive_generation=True,
-    )
-
-    # 如果要使用实时模型而不是语音管道，可以使用以下配置：
-    # session = AgentSession(
-    #     # 实时模型提供更低延迟的语音交互体验
-    #     llm=openai.realtime.RealtimeModel(voice="marin")
-    # )
+        # LLM 实例在整个会话中复用同一个保持长连接的 HTTP 连接池
+        # 一句中文的英文翻译很少超过 40 个 token，限制输出长度以控制最坏情况下的解码耗时
+        # DeepSeek 接口文档使用 max_tokens 而不是 max_completion_tokens，通过 extra_body 直接传递；
+        # 遇到空行即停止，模型在译完一句后就结束生成
+        deepseek_llm = openai.LLM(
+            model=MODEL_NAME,
+            base_url=DEEPSEEK_BASE_URL,
+            temperature=0.2,
+            extra_body={"max_tokens": 80, "stop": ["\n\n"]},
+        )
+        # 在会话启动的同时后台预热 LLM 连接，TLS/TCP 握手不再落在用户的第一轮对话上
+        llm_warmup = asyncio.create_task(_warm_up_llm(deepseek_llm))
+
+        # 创建语音 AI 管道，整合 LLM、STT、TTS 和语音检测功能
+        session = AgentSession(
+            llm=deepseek_llm,
+
+            # STT (语音转文本) - Agent 的"耳朵"，将用户的中文语音转换为文本
+            # 使用 Cartesia 的 ink-whisper 模型进行语音识别
+            stt=cartesia.STT(
+                model="ink-whisper",
+                base_url=CARTESIA_BASE_URL,
+            ),
+            # TTS (文本转语音) - Agent 的"嘴巴"，将翻译后的英文文本转换为语音
+            # 使用指定的语音 ID 生成自然的英文语音
+            # 输出固定为英文，选用首包延迟最低的 sonic-turbo 模型，16kHz 采样率减少传输和解码开销
+            tts=cartesia.TTS(
+                model="sonic-turbo",
+                language="en",
+                voice="6f84f4b8-58a2-430c-8c79-688dad597532",
+                sample_rate=16000,
+                base_url=CARTESIA_BASE_URL,
+            ),
+            # 多语言轮次检测 - 判断用户何时开始和结束说话
+            turn_detection=MultilingualModel(),
+            # VAD (语音活动检测) - 检测是否有语音输入
+            vad=ctx.proc.userdata["vad"],
+            # 端点检测延迟 - 用户停止说话后等待多久判定本轮结束
+            min_endpointing_delay=MIN_ENDPOINTING_DELAY,
+            max_endpointing_delay=MAX_ENDPOINTING_DELAY,
+            # 预生成模式 - 允许 LLM 在等待用户说话结束前就开始生成响应，提高响应速度
+            preemptive_generation=True,
+        )
 
-    # 记录语音转文本的最终结果
-    @session.on("user_speech_committed")
-    def _on_user_speech_committed(ev):
-        logger.info(f"STT 最终结果: {ev.user_transcript}")
-
-    # 记录实时语音转录结果（可能包含部分识别结果）
-    @session.on("user_transcript_received")
-    def _on_user_transcript_received(ev):
-        logger.info(f"用户说话内容: {ev.transcript}")
-
-    # 记录 LLM 生成的翻译结果
-    @session.on("agent_speech_committed")
-    def _on_agent_speech_committed(ev):
-        logger.info(f"LLM 翻译输出: {ev.agent_transcript}")
-
-    # 记录 LLM 实时生成的内容（可能包含部分生成结果）
-    @session.on("agent_transcript_received")
-    def _on_agent_transcript_received(ev):
-        cleaned_text = clean_llm_output(ev.transcript)
+    # 记录语音转录结果：部分识别结果和最终结果
+    @session.on("user_input_transcribed")
+    def _on_user_input_transcribed(ev: UserInputTranscribedEvent):
+        if ev.is_final:
+            logger.info("STT 最终结果: %s", ev.transcript)
+        else:
+            logger.info("用户说话内容: %s", ev.transcript)
+
+    # 记录 LLM 生成的翻译结果：每条回复写入对话历史时触发一次，只对完整文本清理一次
+    @session.on("conversation_item_added")
+    def _on_conversation_item_added(ev: ConversationItemAddedEvent):
+        item = ev.item
+        if item.type != "message" or item.role != "assistant":
+            return
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        text = item.text_content or ""
+        cleaned_text = clean_llm_output(text)
         logger.info(
-            f"LLM 实时输出: '{ev.transcript}' -> 清理后: '{cleaned_text}' (原长度: {len(ev.transcript)}, 清理后长度: {len(cleaned_text)})")
-
-    # 监听 LLM 开始生成响应的事件
-    @session.on("agent_started_speaking")
-    def _on_agent_started_speaking(ev):
-        logger.info("Agent 开始生成语音响应")
+            "LLM 翻译输出: '%s' -> 清理后: '%s' (原长度: %d, 清理后长度: %d)",
+            text, cleaned_text, len(text), len(cleaned_text))
 
-    # 监听 LLM 停止生成响应的事件
-    @session.on("agent_stopped_speaking")
-    def _on_agent_stopped_speaking(ev):
-        logger.info("Agent 停止生成语音响应")
+    # 监听 Agent 开始和停止语音响应
+    @session.on("agent_state_changed")
+    def _on_agent_state_changed(ev: AgentStateChangedEvent):
+        if ev.new_state == "speaking":
+            logger.info("Agent 开始生成语音响应")
+        elif ev.old_state == "speaking":
+            logger.info("Agent 停止生成语音响应")
 
     # 处理误判中断：有时背景噪音可能会误触发中断，这些被认为是假阳性中断
     # 当检测到误判时，恢复 Agent 的语音输出
@@ -201,17 +387,50 @@ async def entrypoint(ctx: JobContext):
     # 性能指标收集 - 用于监控管道性能和资源使用情况
     usage_collector = metrics.UsageCollector()
 
+    # 指标事件只入队，日志记录和统计由后台任务处理，不占用实时音频事件的处理路径
+    metrics_queue: asyncio.Queue = asyncio.Queue()
+
     @session.on("metrics_collected")
     def _on_metrics_collected(ev: MetricsCollectedEvent):
+        metrics_queue.put_nowait(ev.metrics)
+
+    def _process_metrics(collected):
         # 记录性能指标到日志
-        metrics.log_metrics(ev.metrics)
+        metrics.log_metrics(collected)
         # 收集使用情况统计
-        usage_collector.collect(ev.metrics)
+        usage_collector.collect(collected)
+
+    async def _metrics_worker():
+        """后台处理指标队列"""
+        while True:
+            collected = await metrics_queue.get()
+            # 单条指标处理失败不能让后台任务退出，否则队列会在会话剩余时间内无限增长
+            try:
+                _process_metrics(collected)
+            except Exception:
+                logger.exception("处理性能指标失败，已跳过")
+
+    metrics_task = asyncio.create_task(_metrics_worker())
 
     async def log_usage():
         """在 Agent 关闭时输出使用情况摘要"""
+        metrics_task.cancel()
+        if llm_warmup is not None:
+            llm_warmup.cancel()
+        # 处理队列中剩余的指标，保证统计完整；单条失败不影响后续的使用情况摘要
+        while not metrics_queue.empty():
+            try:
+                _process_metrics(metrics_queue.get_nowait())
+            except Exception:
+                logger.exception("处理性能指标失败，已跳过")
         summary = usage_collector.get_summary()
-        logger.info(f"使用情况统计: {summary}")
+        logger.info("使用情况统计: %s", summary)
+        # DeepSeek 自动对重复的请求前缀做缓存，汇总整场会话的命中率以确认系统指令前缀被复用
+        if summary.llm_prompt_tokens:
+            logger.info(
+                "LLM 前缀缓存命中率: %.1f%% (%d/%d tokens)",
+                100 * summary.llm_prompt_cached_tokens / summary.llm_prompt_tokens,
+                summary.llm_prompt_cached_tokens, summary.llm_prompt_tokens)
 
     # 注册关闭回调，确保在 Agent 停止时记录使用统计
     ctx.add_shutdown_callback(log_usage)
@@ -236,7 +455,11 @@ async def entrypoint(ctx: JobContext):
         ),
     )
 
-    session.say("你好，我是你的AI翻译助手，请说中文，我会帮你翻译成英文", allow_interruptions=False)
+    if USE_REALTIME_MODEL:
+        # 实时模型模式下没有独立的 TTS，无法使用 say，改为让模型自己说出欢迎语
+        session.generate_reply(instructions=f"Greet the user by saying exactly: {WELCOME_MESSAGE}")
+    else:
+        session.say(WELCOME_MESSAGE, allow_interruptions=False)
     # 加入房间并连接到用户
     await ctx.connect()
 
@@ -0,0 +1,50 @@
+"""
+LLM 输出文本清理工具
+
+纯字符串处理、无外部依赖，可选用 mypyc 编译为 C 扩展以去除解释器开销：
+
+    mypyc text_clean.py
+
+编译产物 (.so / .pyd) 与本文件同目录时会被优先导入，未编译时按普通 Python 模块运行。
+"""
+import re
+
+# 预编译正则表达式，避免在流式输出的每次调用中重复解析
+_THINK_RE = re.compile(r'<think>.*?</think>', re.DOTALL | re.IGNORECASE)
+_WS_RE = re.compile(r'\s+')
+_CJK_RE = re.compile(r'[\u4e00-\u9fff]')
+# 匹配连续的"非单词"片段：<think></think> 标签块、标点符号和空白
+_CLEAN_THINK_RE = re.compile(r'(?:<think>.*?</think>|\W)+', re.DOTALL | re.IGNORECASE)
+# 文本中没有 "<" 时不可能出现标签，省去标签分支，只处理标点和空白
+_CLEAN_RE = re.compile(r'\W+')
+
+
+def _replace_noise(match: re.Match[str]) -> str:
+    """片段中（标签之外）含有空白则替换为单个空格，否则直接删除"""
+    run = match.group(0)
+    if '<' in run:
+        run = _THINK_RE.sub('', run)
+    return ' ' if _WS_RE.search(run) else ''
+
+
+def clean_llm_output(text: str) -> str:
+    """
+    清理 LLM 输出文本，去除 <think></think> 标签和标点符号
+    只保留单词用于 TTS 合成
+    """
+    if not text:
+        return ""
+
+    # 单次扫描完成：去除 <think></think> 标签及其内容、去除所有标点符号、合并多余的空格
+    pattern = _CLEAN_THINK_RE if '<' in text else _CLEAN_RE
+    return pattern.sub(_replace_noise, text).strip()
+
+
+def is_chinese_text(text: str) -> bool:
+    """
+    检测文本是否包含中文字符
+    """
+    # 纯 ASCII 文本（英文输出的常见情况）不可能包含中文，isascii 在 C 层完成判断
+    if text.isascii():
+        return False
+    return _CJK_RE.search(text) is not None